@@ -5,18 +5,32 @@ Collects and summarizes diagnostic results from
 DNS, TCP, UDP, and latency checks.
 """
 
+import sys
+from array import array
+
+NAN = float("nan")
+
+# Per-port report lines, indexed by the success flag (0 = failure, 1 = success)
+_TCP_LINES = ("  - Port {}: FAIL ({})", "  - Port {}: PASS ({})")
+_UDP_LINES = ("  - Port {}: WARN ({})", "  - Port {}: PASS ({})")
+_LATENCY_LINES = ("  - Port {}: FAILED", "  - Port {}: {} ms")
+
 
 def create_summary(hostname: str, ip: str):
     """
     Initialize a diagnostic summary structure.
+
+    Per-port results are stored column-wise (parallel arrays indexed by
+    probe order) rather than as one small dict per port, which keeps large
+    port sweeps compact.
     """
     return {
         "target": hostname,
         "ip_address": ip,
         "dns": None,
-        "tcp": {},
-        "udp": {},
-        "latency": {},
+        "tcp": {"ports": [], "success": array("b"), "detail": []},
+        "udp": {"ports": [], "success": array("b"), "detail": []},
+        "latency": {"ports": [], "success": array("b"), "latency_ms": array("d")},
         "overall_status": "UNKNOWN"
     }
 
@@ -29,24 +43,25 @@ def record_dns(summary: dict, success: bool, detail: str):
 
 
 def record_tcp(summary: dict, port: int, success: bool, detail: str):
-    summary["tcp"][port] = {
-        "success": success,
-        "detail": detail
-    }
+    tcp = summary["tcp"]
+    tcp["ports"].append(port)
+    tcp["success"].append(success)
+    tcp["detail"].append(detail)
 
 
 def record_udp(summary: dict, port: int, success: bool, detail: str):
-    summary["udp"][port] = {
-        "success": success,
-        "detail": detail
-    }
+    udp = summary["udp"]
+    udp["ports"].append(port)
+    udp["success"].append(success)
+    udp["detail"].append(detail)
 
 
 def record_latency(summary: dict, port: int, success: bool, latency_ms):
-    summary["latency"][port] = {
-        "success": success,
-        "latency_ms": latency_ms
-    }
+    latency = summary["latency"]
+    latency["ports"].append(port)
+    latency["success"].append(success)
+    # array('d') cannot hold None, so a missing measurement is stored as NaN
+    latency["latency_ms"].append(NAN if latency_ms is None else latency_ms)
 
 
 def evaluate_overall_status(summary: dict):
@@ -57,49 +72,88 @@ def evaluate_overall_status(summary: dict):
         summary["overall_status"] = "UNREACHABLE"
         return
 
-    if any(not result["success"] for result in summary["tcp"].values()):
+    # array.__contains__ scans the raw bytes in C, no per-port Python work
+    if 0 in summary["tcp"]["success"]:
         summary["overall_status"] = "PARTIALLY REACHABLE"
         return
 
     summary["overall_status"] = "REACHABLE"
 
 
+def export_summary(summary: dict) -> dict:
+    """
+    Convert a summary into plain JSON-serializable data.
+    Each per-port section becomes a list of records.
+    """
+    tcp = summary["tcp"]
+    udp = summary["udp"]
+    latency = summary["latency"]
+
+    return {
+        "target": summary["target"],
+        "ip_address": summary["ip_address"],
+        "dns": summary["dns"],
+        "tcp": [
+            {"port": port, "success": bool(success), "detail": detail}
+            for port, success, detail in zip(tcp["ports"], tcp["success"], tcp["detail"])
+        ],
+        "udp": [
+            {"port": port, "success": bool(success), "detail": detail}
+            for port, success, detail in zip(udp["ports"], udp["success"], udp["detail"])
+        ],
+        "latency": [
+            {"port": port, "success": bool(success), "latency_ms": latency_ms if success else None}
+            for port, success, latency_ms in zip(
+                latency["ports"], latency["success"], latency["latency_ms"]
+            )
+        ],
+        "overall_status": summary["overall_status"]
+    }
+
+
 def print_summary(summary: dict, log=None):
     """
     Print a diagnostic summary.
     If log is provided, it will be used for output.
-    Otherwise, print() is used.
+    Otherwise, the summary is written to stdout.
+
+    The report is built up in memory and emitted with a single call,
+    rather than one write per line.
     """
-    log = log or print   
+    lines = []
+    add = lines.append
 
-    log("\n" + "=" * 60)
-    log("Diagnostic Summary")
-    log("=" * 60)
+    add("\n" + "=" * 60)
+    add("Diagnostic Summary")
+    add("=" * 60)
 
-    log(f"Target: {summary['target']}")
-    log(f"IP Address: {summary['ip_address']}\n")
+    add(f"Target: {summary['target']}")
+    add(f"IP Address: {summary['ip_address']}\n")
 
     dns = summary["dns"]
     dns_status = "PASS" if dns["success"] else "FAIL"
-    log(f"DNS Resolution: {dns_status} ({dns['detail']})\n")
-
-    log("TCP Connectivity:")
-    for port, result in summary["tcp"].items():
-        status = "PASS" if result["success"] else "FAIL"
-        log(f"  - Port {port}: {status} ({result['detail']})")
-
-    log("\nUDP Connectivity:")
-    for port, result in summary["udp"].items():
-        status = "PASS" if result["success"] else "WARN"
-        log(f"  - Port {port}: {status} ({result['detail']})")
-
-    log("\nLatency Measurements:")
-    for port, result in summary["latency"].items():
-        if result["success"]:
-            log(f"  - Port {port}: {result['latency_ms']} ms")
-        else:
-            log(f"  - Port {port}: FAILED")
-
-    log(f"\nOverall Status: {summary['overall_status']}")
-    log("=" * 60)
-
+    add(f"DNS Resolution: {dns_status} ({dns['detail']})\n")
+
+    add("TCP Connectivity:")
+    tcp = summary["tcp"]
+    for port, success, detail in zip(tcp["ports"], tcp["success"], tcp["detail"]):
+        add(_TCP_LINES[success].format(port, detail))
+
+    add("\nUDP Connectivity:")
+    udp = summary["udp"]
+    for port, success, detail in zip(udp["ports"], udp["success"], udp["detail"]):
+        add(_UDP_LINES[success].format(port, detail))
+
+    add("\nLatency Measurements:")
+    latency = summary["latency"]
+    for port, success, latency_ms in zip(latency["ports"], latency["success"], latency["latency_ms"]):
+        add(_LATENCY_LINES[success].format(port, latency_ms))
+
+    add(f"\nOverall Status: {summary['overall_status']}")
+    add("=" * 60)
+
+    text = "\n".join(lines)
+    if log is None:
+        sys.stdout.write(text + "\n")
+    else:
+        log(text)
@@ -6,8 +6,108 @@ This step verifies whether the hostname can be successfully
 translated into an IP address before any TCP/UDP communication.
 """
 
+import asyncio
 import socket
-from typing import Callable, Optional, Tuple
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, Optional, Tuple
+
+
+# hostname -> (ip_address, expires_at) on the time.monotonic() clock.
+# Insertion order doubles as age order, so the oldest entry is evicted first.
+_CACHE: Dict[str, Tuple[str, float]] = {}
+_TTL = 60.0
+_CACHE_MAXSIZE = 1024
+
+# hostname -> lookup currently in progress. Concurrent callers for the same
+# hostname wait on it instead of issuing their own getaddrinfo.
+_INFLIGHT: Dict[str, Future] = {}
+_INFLIGHT_ASYNC: Dict[str, "asyncio.Task"] = {}
+
+_LOCK = threading.Lock()
+
+
+def _cache_get(hostname: str) -> Optional[str]:
+    with _LOCK:
+        cached = _CACHE.get(hostname)
+    if cached is not None and cached[1] > time.monotonic():
+        return cached[0]
+    return None
+
+
+def _cache_put(hostname: str, ip_address: str) -> None:
+    with _LOCK:
+        _CACHE.pop(hostname, None)
+        _CACHE[hostname] = (ip_address, time.monotonic() + _TTL)
+        if len(_CACHE) > _CACHE_MAXSIZE:
+            _CACHE.pop(next(iter(_CACHE)))
+
+
+def _resolve(hostname: str) -> str:
+    """Resolve hostname, joining a lookup already in flight in another thread."""
+    with _LOCK:
+        pending = _INFLIGHT.get(hostname)
+        if pending is None:
+            future = _INFLIGHT[hostname] = Future()
+
+    if pending is not None:
+        return pending.result()
+
+    try:
+        # A-record only lookup: unlike gethostbyname, this never races an
+        # AAAA query alongside the A query.
+        infos = socket.getaddrinfo(
+            hostname, None, socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP
+        )
+        ip_address = infos[0][4][0]
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    else:
+        _cache_put(hostname, ip_address)
+        future.set_result(ip_address)
+        return ip_address
+    finally:
+        with _LOCK:
+            del _INFLIGHT[hostname]
+
+
+async def _lookup_async(hostname: str) -> str:
+    loop = asyncio.get_running_loop()
+    infos = await loop.getaddrinfo(
+        hostname, None,
+        family=socket.AF_INET, type=socket.SOCK_STREAM, proto=socket.IPPROTO_TCP
+    )
+    ip_address = infos[0][4][0]
+    _cache_put(hostname, ip_address)
+    return ip_address
+
+
+def _lookup_done(hostname: str, lookup: "asyncio.Task") -> None:
+    if _INFLIGHT_ASYNC.get(hostname) is lookup:
+        del _INFLIGHT_ASYNC[hostname]
+    # Mark the outcome as retrieved so asyncio doesn't warn when every
+    # waiter was cancelled before the lookup finished
+    if not lookup.cancelled():
+        lookup.exception()
+
+
+async def _resolve_async(hostname: str) -> str:
+    """
+    Asyncio counterpart of _resolve.
+
+    The lookup runs as its own task and every caller awaits it through
+    shield(), so cancelling one caller never cancels the lookup the others
+    are waiting on.
+    """
+    lookup = _INFLIGHT_ASYNC.get(hostname)
+    if lookup is None:
+        lookup = asyncio.ensure_future(_lookup_async(hostname))
+        _INFLIGHT_ASYNC[hostname] = lookup
+        lookup.add_done_callback(lambda task: _lookup_done(hostname, task))
+
+    return await asyncio.shield(lookup)
 
 
 def dns_check(
@@ -27,20 +127,81 @@ def dns_check(
             result:  IPv4 address on success, error message on failure
     """
 
-    def _log(msg: str) -> None:
-        if log:
-            log(msg)
+    do_log = log is not None
 
     # Basic type check (defensive)
     if not isinstance(hostname, str):
         return False, "Hostname must be a string"
 
+    cached = _cache_get(hostname)
+    if cached is not None:
+        if do_log:
+            log(f"[DNS] Cache hit: {cached}")
+        return True, cached
+
+    try:
+        if do_log:
+            log(f"[DNS] Resolving hostname: {hostname}")
+
+        ip_address = _resolve(hostname)
+
+        if do_log:
+            log(f"[DNS] Resolution successful: {ip_address}")
+        return True, ip_address
+
+    except socket.gaierror as e:
+        return False, f"DNS resolution failed: {e}"
+
+    except UnicodeError:
+        return False, "Invalid hostname encoding"
+
+    except socket.timeout:
+        return False, "DNS request timed out"
+
+    except OSError as e:
+        return False, f"Unexpected OS error: {e}"
+
+    except Exception as e:
+        return False, f"Unexpected error: {e}"
+
+
+async def dns_check_async(
+    hostname: str,
+    log: Optional[Callable[[str], None]] = None
+) -> Tuple[bool, str]:
+    """
+    Asyncio variant of dns_check; the lookup runs without blocking the loop.
+
+    Args:
+        hostname: The domain name to resolve (e.g. "google.com")
+        log: Optional logging function
+
+    Returns:
+        (success, result):
+            success: True if resolution succeeded
+            result:  IPv4 address on success, error message on failure
+    """
+
+    do_log = log is not None
+
+    # Basic type check (defensive)
+    if not isinstance(hostname, str):
+        return False, "Hostname must be a string"
+
+    cached = _cache_get(hostname)
+    if cached is not None:
+        if do_log:
+            log(f"[DNS] Cache hit: {cached}")
+        return True, cached
+
     try:
-        _log(f"[DNS] Resolving hostname: {hostname}")
+        if do_log:
+            log(f"[DNS] Resolving hostname: {hostname}")
 
-        ip_address = socket.gethostbyname(hostname)
+        ip_address = await _resolve_async(hostname)
 
-        _log(f"[DNS] Resolution successful: {ip_address}")
+        if do_log:
+            log(f"[DNS] Resolution successful: {ip_address}")
         return True, ip_address
 
     except socket.gaierror as e:
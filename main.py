@@ -7,26 +7,28 @@ Usage examples:
   python main.py google.com --tcp 80 443 --udp 53 --timeout 3
 """
 
-import argparse
-import json
+import asyncio
 import sys
+from types import SimpleNamespace
 
 from diagnostic_summary import (
     create_summary,
     evaluate_overall_status,
+    export_summary,
     print_summary,
     record_dns,
     record_latency,
     record_tcp,
     record_udp,
 )
-from dns_check import dns_check
-from tcp_check import tcp_check
-from udp_check import udp_check
+from dns_check import dns_check_async
+from tcp_check import prefetch_tcp_sockets, tcp_check_batch
+from udp_check import open_udp_endpoint, udp_check_batch_async
 
 
 DEFAULT_TCP_PORTS = [80, 443]
 DEFAULT_UDP_PORTS = [53]
+DEFAULT_TIMEOUT = 3.0
 
 
 def log(message: str) -> None:
@@ -34,8 +36,61 @@ def log(message: str) -> None:
     print(message, file=sys.stderr)
 
 
+def _load_orjson():
+    """
+    Return the optional orjson module (a C encoder, much faster than stdlib
+    json), or None if it is not installed. Imported only on the JSON path.
+    """
+    try:
+        import orjson
+    except ImportError:
+        return None
+    return orjson
+
+
+def dump_json(summary: dict) -> bytes:
+    """
+    Encode the summary as indented UTF-8 JSON bytes, using orjson when
+    available (it produces bytes directly, with no intermediate str).
+    """
+    orjson = _load_orjson()
+    if orjson is not None:
+        return orjson.dumps(summary, option=orjson.OPT_INDENT_2)
+
+    import json  # only needed on the JSON output path
+    # ensure_ascii=False emits raw UTF-8, matching orjson byte for byte
+    return json.dumps(summary, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def write_json(summary: dict, to_stdout: bool, json_out) -> None:
+    """
+    Emit the summary as JSON to stdout and/or a file, encoding it at most once.
+    """
+    summary = export_summary(summary)
+    data = dump_json(summary) if to_stdout else None
+
+    if to_stdout:
+        # Write the bytes to the underlying buffer, skipping text-mode encoding
+        sys.stdout.flush()
+        sys.stdout.buffer.write(data + b"\n")
+        sys.stdout.buffer.flush()
+
+    if json_out:
+        if data is None and _load_orjson() is None:
+            # Stream straight into the file, no intermediate string
+            import json
+            with open(json_out, "w", encoding="utf-8") as f:
+                json.dump(summary, f, indent=2, ensure_ascii=False)
+            return
+
+        with open(json_out, "wb") as f:
+            f.write(data if data is not None else dump_json(summary))
+
+
 def valid_port(p: str) -> int:
     """argparse type validator for port numbers."""
+    import argparse
+
     port = int(p)
     if port < 1 or port > 65535:
         raise argparse.ArgumentTypeError("Port must be 1-65535")
@@ -43,6 +98,21 @@ def valid_port(p: str) -> int:
 
 
 def parse_args():
+    # Fast path for the common `main.py <target>` invocation: no flags means
+    # all defaults, so skip importing argparse and building the parser.
+    argv = sys.argv[1:]
+    if len(argv) == 1 and not argv[0].startswith("-"):
+        return SimpleNamespace(
+            target=argv[0],
+            tcp=list(DEFAULT_TCP_PORTS),
+            udp=list(DEFAULT_UDP_PORTS),
+            timeout=DEFAULT_TIMEOUT,
+            json=False,
+            json_out=None,
+        )
+
+    import argparse
+
     parser = argparse.ArgumentParser(
         description="Mini Network Diagnostic Tool: DNS + TCP/UDP + Latency + Summary"
     )
@@ -71,7 +141,7 @@ def parse_args():
     parser.add_argument(
         "--timeout",
         type=float,
-        default=3.0,
+        default=DEFAULT_TIMEOUT,
         help="Socket timeout in seconds (default: 3.0)",
     )
 
@@ -91,7 +161,7 @@ def parse_args():
     return parser.parse_args()
 
 
-def main():
+async def main():
     args = parse_args()
 
     hostname = args.target.strip()
@@ -113,31 +183,80 @@ def main():
     log(f"Timeout: {timeout}s")
     log("=" * 60)
 
-    # DNS Resolution
-    dns_ok, dns_result = dns_check(hostname, log=log)
-    if not dns_ok:
-        summary = create_summary(hostname, None)
-        record_dns(summary, False, dns_result)
-        evaluate_overall_status(summary)
-
-        if args.json:
-            json_text = json.dumps(summary, indent=2)
-            print(json_text)
-            if args.json_out:
-                with open(args.json_out, "w", encoding="utf-8") as f:
-                    f.write(json_text)
+    # DNS Resolution. The lookup runs in the background while the probe
+    # sockets are created, since that does not depend on the address.
+    dns_task = asyncio.create_task(dns_check_async(hostname, log=log))
+    udp_endpoint = None
+    udp_results = None
+    tcp_socks = []
+
+    try:
+        # Socket setup failures (e.g. EMFILE) become per-port errors below
+        try:
+            udp_endpoint = await open_udp_endpoint()
+        except OSError as e:
+            udp_results = e
+
+        try:
+            tcp_socks = prefetch_tcp_sockets(tcp_ports)
+        except OSError:
+            # tcp_check_batch creates its own sockets and reports per-port errors
+            tcp_socks = []
+
+        dns_ok, dns_result = await dns_task
+        if not dns_ok:
+            summary = create_summary(hostname, None)
+            record_dns(summary, False, dns_result)
+            evaluate_overall_status(summary)
+
+            write_json(summary, args.json, args.json_out)
+            if not args.json:
+                print_summary(summary, log=log)
             return
 
-        print_summary(summary, log=log)
-        
-
-    ip_address = dns_result
-    summary = create_summary(hostname, ip_address)
-    record_dns(summary, True, f"Resolved to {ip_address}")
+        ip_address = dns_result
+        summary = create_summary(hostname, ip_address)
+        record_dns(summary, True, f"Resolved to {ip_address}")
+
+        # TCP + UDP probes run concurrently, so wall time is ~max(timeout)
+        # rather than (number of ports) x timeout. All TCP connects are
+        # multiplexed by a single selector in one worker thread; all UDP
+        # probes are sent as one batch through a single shared socket.
+        probes = [
+            asyncio.to_thread(
+                tcp_check_batch, ip_address, tcp_ports, timeout, log, None, tcp_socks
+            )
+        ]
+        if udp_endpoint is not None:
+            probes.append(
+                udp_check_batch_async(ip_address, udp_ports, timeout=timeout, log=log, endpoint=udp_endpoint)
+            )
+
+        tcp_results, *udp_probe_results = await asyncio.gather(*probes, return_exceptions=True)
+        if udp_probe_results:
+            udp_results = udp_probe_results[0]
+    finally:
+        if not dns_task.done():
+            dns_task.cancel()
+        if udp_endpoint is not None:
+            udp_endpoint.close()
+        for sock in tcp_socks:
+            sock.close()
+
+    if isinstance(tcp_results, BaseException):
+        error = (False, f"Unexpected error: {tcp_results}", None)
+        tcp_results = {port: error for port in tcp_ports}
+
+    if isinstance(udp_results, OSError):
+        error = (False, f"OS error during UDP probe: {udp_results}")
+        udp_results = {port: error for port in udp_ports}
+    elif isinstance(udp_results, BaseException):
+        error = (False, f"Unexpected error: {udp_results}")
+        udp_results = {port: error for port in udp_ports}
 
     # TCP Connectivity Check (also captures latency)
     for port in tcp_ports:
-        ok, detail, latency_ms = tcp_check(ip_address, port, timeout=timeout, log=log)
+        ok, detail, latency_ms = tcp_results[port]
         record_tcp(summary, port, ok, detail)
 
         if ok and latency_ms is not None:
@@ -147,22 +266,15 @@ def main():
 
     # UDP Connectivity Check 
     for port in udp_ports:
-        ok, detail = udp_check(ip_address, port, timeout=timeout, log=log)
+        ok, detail = udp_results[port]
         record_udp(summary, port, ok, detail)
 
     # Final Evaluation & Output
     evaluate_overall_status(summary)
     print_summary(summary, log=log)
+    write_json(summary, args.json, args.json_out)
 
-    if args.json:
-        json_text = json.dumps(summary, indent=2)
-        print(json_text)
-
-    if args.json_out:
-        with open(args.json_out, "w", encoding="utf-8") as f:
-            f.write(json_text)
-    
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
 
@@ -1,13 +1,88 @@
+import errno
+import os
+import selectors
 import socket
+import threading
 import time
-from typing import Callable, Tuple, Optional
+from typing import Callable, Dict, Iterable, List, Tuple, Optional
+
+try:
+    import resource  # POSIX only
+except ImportError:
+    resource = None
+
+
+# connect_ex() codes meaning "handshake started, wait for writability"
+_CONNECT_IN_PROGRESS = {0, errno.EINPROGRESS, errno.EWOULDBLOCK, getattr(errno, "WSAEWOULDBLOCK", 10035)}
+_CONNECT_REFUSED = {errno.ECONNREFUSED, getattr(errno, "WSAECONNREFUSED", 10061)}
+
+# Upper bound on sockets tcp_check_batch keeps open at the same time
+_MAX_BATCH_SIZE = 256
+
+# (host, port, timeout) -> (expires_at, success, detail, latency_ms) for
+# tcp_check's opt-in cache_ttl; expiry is on the time.monotonic() clock and
+# the oldest entry is evicted first.
+_TCP_CACHE: Dict[Tuple[str, int, float], Tuple[float, bool, str, Optional[float]]] = {}
+_TCP_CACHE_MAXSIZE = 1024
+_TCP_CACHE_LOCK = threading.Lock()
+
+
+def _make_tcp_socket() -> socket.socket:
+    """
+    Create a TCP probe socket with SO_REUSEADDR and TCP_NODELAY set.
+
+    These are defensive: the probe only times the connect handshake, which
+    neither option affects, but they keep any future payload exchange on
+    the socket free of Nagle delays.
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return sock
+
+
+def _tcp_connect(
+    host: str,
+    port: int,
+    timeout: float,
+    log: Optional[Callable[[str], None]]
+) -> Tuple[bool, str, Optional[float]]:
+    """Open (and immediately close) one TCP connection, timing the handshake."""
+    try:
+        if log is not None:
+            log(f"[TCP] Testing TCP connectivity to {host}:{port} (timeout={timeout}s)")
+
+        sock = _make_tcp_socket()
+        sock.settimeout(timeout)
+
+        start = time.perf_counter()
+        sock.connect((host, port))
+        end = time.perf_counter()
+
+        latency_ms = round((end - start) * 1000, 2)
+        sock.close()
+
+        return True, f"Connection successful ({latency_ms} ms)", latency_ms
+
+    except socket.timeout:
+        return False, "TCP connection timed out", None
+
+    except ConnectionRefusedError:
+        return False, "Connection refused (RST)", None
+
+    except OSError as e:
+        return False, f"OS error: {e}", None
+
+    except Exception as e:
+        return False, f"Unexpected error: {e}", None
 
 
 def tcp_check(
     host: str,
     port: int,
     timeout: float = 3.0,
-    log: Optional[Callable[[str], None]] = None
+    log: Optional[Callable[[str], None]] = None,
+    cache_ttl: float = 0.0
 ) -> Tuple[bool, str, Optional[float]]:
     """
     Attempt a TCP connection and measure connect latency.
@@ -16,6 +91,9 @@ def tcp_check(
         host: target IP address
         port: TCP port to test
         timeout: socket timeout in seconds
+        cache_ttl: if > 0, reuse the result of a probe to the same (host, port)
+                   with the same timeout made within the last cache_ttl
+                   seconds (e.g. when polling)
 
     Returns:
         success (bool)
@@ -23,9 +101,7 @@ def tcp_check(
         latency_ms (float | None)
     """
 
-    def _log(msg: str):
-        if log:
-            log(msg)
+    do_log = log is not None
 
     # Port validation
     if not isinstance(port, int):
@@ -33,30 +109,211 @@ def tcp_check(
     if port < 1 or port > 65535:
         return False, "Port must be between 1 and 65535", None
 
+    if cache_ttl <= 0:
+        return _tcp_connect(host, port, timeout, log)
+
+    key = (host, port, timeout)
+    with _TCP_CACHE_LOCK:
+        cached = _TCP_CACHE.get(key)
+    if cached is not None and cached[0] > time.monotonic():
+        if do_log:
+            log(f"[TCP] Cached result for {host}:{port}")
+        return cached[1:]
+
+    result = _tcp_connect(host, port, timeout, log)
+
+    with _TCP_CACHE_LOCK:
+        _TCP_CACHE.pop(key, None)
+        _TCP_CACHE[key] = (time.monotonic() + cache_ttl,) + result
+        if len(_TCP_CACHE) > _TCP_CACHE_MAXSIZE:
+            _TCP_CACHE.pop(next(iter(_TCP_CACHE)), None)
+
+    return result
+
+
+def _connect_error(err: int) -> Tuple[bool, str, Optional[float]]:
+    """Map a connect() errno to the same result tcp_check would report."""
+    if err in _CONNECT_REFUSED:
+        return False, "Connection refused (RST)", None
+    return False, f"OS error: {OSError(err, os.strerror(err))}", None
+
+
+def _default_batch_size() -> int:
+    """Sockets per batch: at most 256, and no more than a quarter of the fd limit."""
+    if resource is None:
+        return _MAX_BATCH_SIZE
+    soft_limit = resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+    if soft_limit == resource.RLIM_INFINITY:
+        return _MAX_BATCH_SIZE
+    return max(1, min(_MAX_BATCH_SIZE, soft_limit // 4))
+
+
+def _resolve_ipv4(host: str) -> str:
+    """Return host as an IPv4 literal, resolving it only if it is not one already."""
     try:
-        _log(f"[TCP] Testing TCP connectivity to {host}:{port} (timeout={timeout}s)")
+        socket.inet_pton(socket.AF_INET, host)
+        return host
+    except OSError:
+        pass
+    infos = socket.getaddrinfo(host, None, socket.AF_INET, socket.SOCK_STREAM)
+    return infos[0][4][0]
 
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(timeout)
 
-        start = time.perf_counter()
-        sock.connect((host, port))
+def prefetch_tcp_sockets(ports: List[int]) -> List[socket.socket]:
+    """
+    Create the probe sockets for the first tcp_check_batch batch ahead of
+    time, e.g. while the target's DNS lookup is still in flight.
+    """
+    socks: List[socket.socket] = []
+    try:
+        for _ in range(min(len(ports), _default_batch_size())):
+            socks.append(_make_tcp_socket())
+    except OSError:
+        for sock in socks:
+            sock.close()
+        raise
+    return socks
+
+
+def _collect_ready(
+    sel: selectors.BaseSelector,
+    wait: float,
+    results: Dict[int, Tuple[bool, str, Optional[float]]]
+) -> None:
+    """Record every connect on sel that settles within wait seconds."""
+    for key, _ in sel.select(wait):
         end = time.perf_counter()
+        sock = key.fileobj
+        port, start = key.data
 
-        latency_ms = round((end - start) * 1000, 2)
+        err = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+        sel.unregister(sock)
         sock.close()
 
-        return True, f"Connection successful ({latency_ms} ms)", latency_ms
+        if err == 0:
+            latency_ms = round((end - start) * 1000, 2)
+            results[port] = (True, f"Connection successful ({latency_ms} ms)", latency_ms)
+        else:
+            results[port] = _connect_error(err)
 
-    except socket.timeout:
-        return False, "TCP connection timed out", None
 
-    except ConnectionRefusedError:
-        return False, "Connection refused (RST)", None
+def _probe_batch(
+    sel: selectors.BaseSelector,
+    host: str,
+    ports: List[int],
+    timeout: float,
+    log: Optional[Callable[[str], None]],
+    results: Dict[int, Tuple[bool, str, Optional[float]]],
+    spare: List[socket.socket]
+) -> None:
+    """Connect to every port in one batch and wait on sel until all settle."""
+    valid_ports = []
+    for port in ports:
+        # Port validation
+        if not isinstance(port, int):
+            results[port] = (False, "Port must be an integer", None)
+        elif port < 1 or port > 65535:
+            results[port] = (False, "Port must be between 1 and 65535", None)
+        else:
+            valid_ports.append(port)
 
-    except OSError as e:
-        return False, f"OS error: {e}", None
+    # Log up front so the connect loop below stays tight
+    if log is not None:
+        for port in valid_ports:
+            log(f"[TCP] Testing TCP connectivity to {host}:{port} (timeout={timeout}s)")
 
-    except Exception as e:
-        return False, f"Unexpected error: {e}", None
+    try:
+        for port in valid_ports:
+            sock = None
+            try:
+                sock = spare.pop() if spare else _make_tcp_socket()
+                sock.setblocking(False)
+                start = time.perf_counter()
+                err = sock.connect_ex((host, port))
+            except OSError as e:
+                if sock is not None:
+                    sock.close()
+                results[port] = (False, f"OS error: {e}", None)
+                continue
+
+            if err not in _CONNECT_IN_PROGRESS:
+                sock.close()
+                results[port] = _connect_error(err)
+                continue
+
+            sel.register(sock, selectors.EVENT_WRITE, data=(port, start))
+
+            # Pick up handshakes that already finished, so their end time is
+            # not pushed back by the rest of the batch's setup
+            _collect_ready(sel, 0, results)
+
+        deadline = time.perf_counter() + timeout
+        while sel.get_map():
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            _collect_ready(sel, remaining, results)
+
+        # Anything still registered never completed the handshake
+        for key in list(sel.get_map().values()):
+            results[key.data[0]] = (False, "TCP connection timed out", None)
+
+    finally:
+        for key in list(sel.get_map().values()):
+            sel.unregister(key.fileobj)
+            key.fileobj.close()
+
+
+def tcp_check_batch(
+    host: str,
+    ports: Iterable[int],
+    timeout: float = 3.0,
+    log: Optional[Callable[[str], None]] = None,
+    batch_size: Optional[int] = None,
+    socks: Optional[List[socket.socket]] = None
+) -> Dict[int, Tuple[bool, str, Optional[float]]]:
+    """
+    Probe many TCP ports at once from a single thread.
+
+    Every connect() is issued non-blocking and completion is multiplexed
+    through one selector (epoll/kqueue). Ports are probed in batches so the
+    number of open sockets stays well below the process fd limit and the
+    target does not see an unbounded burst of SYNs.
+
+    Args:
+        host: target IP address (a hostname is resolved once for all ports)
+        ports: TCP ports to test
+        timeout: connect timeout in seconds, applied to each batch
+        batch_size: max sockets open at once (default: min(256, fd limit / 4))
+        socks: Optional sockets from prefetch_tcp_sockets(); they are used
+               before any new socket is created, and are consumed from the list
+
+    Returns:
+        dict mapping port -> (success, detail, latency_ms), as in tcp_check
+    """
+    ports = list(ports)
+    if batch_size is None:
+        batch_size = _default_batch_size()
+
+    spare = socks if socks is not None else []
+    results: Dict[int, Tuple[bool, str, Optional[float]]] = {}
+
+    try:
+        # Resolve once up front; connect() would otherwise run a hostname
+        # through the resolver again for every port.
+        try:
+            host = _resolve_ipv4(host)
+        except OSError as e:
+            error = (False, f"OS error: {e}", None)
+            return {port: error for port in ports}
+
+        # One selector is reused for every batch
+        with selectors.DefaultSelector() as sel:
+            for i in range(0, len(ports), batch_size):
+                _probe_batch(sel, host, ports[i:i + batch_size], timeout, log, results, spare)
+    finally:
+        # Prefetched sockets left over, e.g. for ports that failed validation
+        while spare:
+            spare.pop().close()
 
+    return results
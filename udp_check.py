@@ -5,16 +5,122 @@ Performs a best-effort UDP connectivity check.
 UDP is connectionless, so lack of response does not necessarily indicate failure.
 """
 
+import asyncio
+import ctypes
+import errno
+import os
 import socket
+import struct
+import sys
 import time
-from typing import Callable, Optional, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+
+_PROBE_MESSAGE = b"UDP_DIAGNOSTIC_PROBE"
+
+# Large receive buffer so bursts of replies to many probes are not dropped
+_UDP_RCVBUF = 1 << 20
+
+
+def _make_udp_socket() -> socket.socket:
+    """Create a UDP probe socket with an enlarged receive buffer."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, _UDP_RCVBUF)
+    return sock
+
+
+class _IOVec(ctypes.Structure):
+    _fields_ = [("iov_base", ctypes.c_void_p), ("iov_len", ctypes.c_size_t)]
+
+
+class _MsgHdr(ctypes.Structure):
+    _fields_ = [
+        ("msg_name", ctypes.c_void_p),
+        ("msg_namelen", ctypes.c_uint32),
+        ("msg_iov", ctypes.POINTER(_IOVec)),
+        ("msg_iovlen", ctypes.c_size_t),
+        ("msg_control", ctypes.c_void_p),
+        ("msg_controllen", ctypes.c_size_t),
+        ("msg_flags", ctypes.c_int),
+    ]
+
+
+class _MMsgHdr(ctypes.Structure):
+    _fields_ = [("msg_hdr", _MsgHdr), ("msg_len", ctypes.c_uint)]
+
+
+def _load_sendmmsg():
+    """Return libc's sendmmsg(2), or None where it is unavailable."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        sendmmsg = ctypes.CDLL(None, use_errno=True).sendmmsg
+    except (OSError, AttributeError):
+        return None
+    sendmmsg.argtypes = [ctypes.c_int, ctypes.POINTER(_MMsgHdr), ctypes.c_uint, ctypes.c_int]
+    sendmmsg.restype = ctypes.c_int
+    return sendmmsg
+
+
+_sendmmsg = _load_sendmmsg()
+
+# sendmmsg(2) errors that mean "try again later" rather than "rejected"
+_SEND_RETRY_ERRNOS = {errno.EAGAIN, errno.EWOULDBLOCK, errno.EINTR}
+
+
+def _sendmmsg_batch(
+    fd: int, message: bytes, addrs: List[Tuple[str, int]]
+) -> Tuple[int, Dict[Tuple[str, int], OSError]]:
+    """
+    Send message to every IPv4 addr through sendmmsg(2).
+
+    Returns (handled, errors): addrs[:handled] were either accepted by the
+    kernel or rejected with the error recorded in errors. Sending stops
+    early if the socket would block, so the caller can send addrs[handled:]
+    another way.
+    """
+    count = len(addrs)
+    payload = ctypes.create_string_buffer(message, len(message))
+    iov = _IOVec(ctypes.cast(payload, ctypes.c_void_p), len(message))
+
+    # struct sockaddr_in: family in host byte order, port/address in network order
+    family = struct.pack("=H", socket.AF_INET)
+    names = [
+        ctypes.create_string_buffer(family + struct.pack("!H4s8x", port, socket.inet_aton(ip)), 16)
+        for ip, port in addrs
+    ]
+
+    msgs = (_MMsgHdr * count)()
+    for msg, name in zip(msgs, names):
+        msg.msg_hdr.msg_name = ctypes.cast(name, ctypes.c_void_p)
+        msg.msg_hdr.msg_namelen = 16
+        msg.msg_hdr.msg_iov = ctypes.pointer(iov)
+        msg.msg_hdr.msg_iovlen = 1
+
+    handled = 0
+    errors: Dict[Tuple[str, int], OSError] = {}
+    while handled < count:
+        sent = _sendmmsg(fd, ctypes.pointer(msgs[handled]), count - handled, 0)
+        if sent > 0:
+            handled += sent
+            continue
+
+        # -1 means the first remaining datagram could not be sent
+        err = ctypes.get_errno()
+        if err in _SEND_RETRY_ERRNOS:
+            break
+        errors[addrs[handled]] = OSError(err, os.strerror(err))
+        handled += 1
+
+    return handled, errors
 
 
 def udp_check(
     host: str,
     port: int,
     timeout: float = 3.0,
-    log: Optional[Callable[[str], None]] = None
+    log: Optional[Callable[[str], None]] = None,
+    sock: Optional[socket.socket] = None
 ) -> Tuple[bool, str]:
     """
     Send a UDP probe packet to a host and port and wait for a response.
@@ -23,6 +129,8 @@ def udp_check(
         host: Target hostname or IP
         port: Target UDP port
         timeout: Receive timeout in seconds
+        sock: Optional pre-created SOCK_DGRAM socket to reuse across probes;
+              it is left open for the caller
 
     Returns:
         (success, detail):
@@ -30,9 +138,7 @@ def udp_check(
             detail:  observation message
     """
 
-    def _log(msg: str) -> None:
-        if log:
-            log(msg)
+    do_log = log is not None
 
     # Port validation (avoid crash / undefined behavior)
     if not isinstance(port, int):
@@ -40,31 +146,49 @@ def udp_check(
     if port < 1 or port > 65535:
         return False, "Port must be between 1 and 65535"
 
+    owns_sock = sock is None
+
     try:
-        _log(f"[UDP] Sending UDP probe to {host}:{port} (timeout={timeout}s)")
+        if do_log:
+            log(f"[UDP] Sending UDP probe to {host}:{port} (timeout={timeout}s)")
 
-        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        sock.settimeout(timeout)
+        # Resolve once so replies can be matched against the probed address
+        target = socket.getaddrinfo(
+            host, port, socket.AF_INET, socket.SOCK_DGRAM
+        )[0][4]
+
+        if owns_sock:
+            sock = _make_udp_socket()
 
-        message = b"UDP_DIAGNOSTIC_PROBE"
         start = time.perf_counter()
+        deadline = start + timeout
 
         # Send UDP packet (no handshake)
-        sock.sendto(message, (host, port))
+        sock.sendto(_PROBE_MESSAGE, target)
+
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                # Best-effort: no response doesn't imply failure
+                return True, "No response received (UDP is connectionless)"
+            sock.settimeout(remaining)
+
+            try:
+                data, addr = sock.recvfrom(1024)
+            except socket.timeout:
+                continue
+
+            # A shared socket may also receive stray or late replies
+            # meant for other probes; only the probed address counts
+            if addr != target:
+                continue
 
-        try:
-            data, addr = sock.recvfrom(1024)
             latency_ms = round((time.perf_counter() - start) * 1000, 2)
-            sock.close()
 
-            _log(f"[UDP] Response received from {addr} ({latency_ms} ms)")
+            if do_log:
+                log(f"[UDP] Response received from {addr} ({latency_ms} ms)")
             return True, f"Response received in {latency_ms} ms"
 
-        except socket.timeout:
-            sock.close()
-            # Best-effort: no response doesn't imply failure
-            return True, "No response received (UDP is connectionless)"
-
     except socket.gaierror as e:
         return False, f"Address resolution error: {e}"
 
@@ -74,11 +198,207 @@ def udp_check(
     except Exception as e:
         return False, f"Unexpected error: {e}"
 
+    finally:
+        if owns_sock and sock is not None:
+            sock.close()
+
+
+class UDPProbeEndpoint(asyncio.DatagramProtocol):
+    """
+    A single long-lived UDP socket shared by many concurrent probes.
+
+    Responses are routed to the waiting probe by their sender (ip, port);
+    its future resolves to (sender, arrival time on the perf_counter clock).
+    """
+
+    def __init__(self, sock: Optional[socket.socket] = None):
+        self.transport = None
+        self._sock = sock
+        self._waiters: Dict[Tuple[str, int], asyncio.Future] = {}
+
+    def connection_made(self, transport) -> None:
+        self.transport = transport
+
+    def expect(self, addr: Tuple[str, int]) -> "asyncio.Future":
+        """Register interest in the next datagram sent from addr."""
+        response = asyncio.get_running_loop().create_future()
+        self._waiters[addr] = response
+        return response
+
+    def forget(self, addr: Tuple[str, int]) -> None:
+        self._waiters.pop(addr, None)
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        response = self._waiters.pop(addr[:2], None)
+        if response is not None and not response.done():
+            response.set_result((addr, time.perf_counter()))
+
+    def error_received(self, exc: Exception) -> None:
+        # Only reached for datagrams the transport had to queue (see send());
+        # the socket is unconnected, so the error cannot be tied to one probe.
+        pass
+
+    def send(self, message: bytes, addr: Tuple[str, int]) -> None:
+        """
+        Send one datagram, raising OSError if the kernel rejects it.
+
+        The transport reports send errors only through error_received(), so
+        the underlying non-blocking socket is written directly. A datagram
+        the socket cannot take right now is queued on the transport instead.
+        """
+        if self._sock is None or self.transport.get_write_buffer_size():
+            self.transport.sendto(message, addr)
+            return
+        try:
+            self._sock.sendto(message, addr)
+        except (BlockingIOError, InterruptedError):
+            self.transport.sendto(message, addr)
+
+    def send_many(
+        self, message: bytes, addrs: List[Tuple[str, int]]
+    ) -> Dict[Tuple[str, int], OSError]:
+        """
+        Send message to every addr. On Linux the batch goes out through a
+        single sendmmsg(2) call; anything it does not take is sent one by one.
+
+        Returns the send error for each addr whose datagram was rejected.
+        """
+        handled = 0
+        errors: Dict[Tuple[str, int], OSError] = {}
+        if (_sendmmsg is not None and self._sock is not None and len(addrs) > 1
+                and not self.transport.get_write_buffer_size()):
+            handled, errors = _sendmmsg_batch(self._sock.fileno(), message, addrs)
+
+        for addr in addrs[handled:]:
+            try:
+                self.send(message, addr)
+            except OSError as e:
+                errors[addr] = e
+        return errors
+
+    def close(self) -> None:
+        if self.transport is not None:
+            self.transport.close()
+
+
+async def open_udp_endpoint() -> UDPProbeEndpoint:
+    """Create a UDPProbeEndpoint bound to an ephemeral local port."""
+    loop = asyncio.get_running_loop()
+    sock = _make_udp_socket()
+    try:
+        sock.bind(("0.0.0.0", 0))
+        _, endpoint = await loop.create_datagram_endpoint(lambda: UDPProbeEndpoint(sock), sock=sock)
+    except BaseException:
+        sock.close()
+        raise
+    return endpoint
+
+
+async def udp_check_batch_async(
+    host: str,
+    ports: Iterable[int],
+    timeout: float = 3.0,
+    log: Optional[Callable[[str], None]] = None,
+    endpoint: Optional[UDPProbeEndpoint] = None
+) -> Dict[int, Tuple[bool, str]]:
+    """
+    Send a UDP probe to many ports at once and wait for responses.
+
+    All probes are sent in one batch (a single sendmmsg(2) call on Linux)
+    and share one receive timeout.
+
+    Args:
+        host: Target hostname or IP
+        ports: Target UDP ports
+        timeout: Receive timeout in seconds, shared by the whole batch
+        endpoint: Optional shared endpoint from open_udp_endpoint();
+                  it is left open for the caller
+
+    Returns:
+        dict mapping port -> (success, detail), as in udp_check
+    """
+
+    do_log = log is not None
+    results: Dict[int, Tuple[bool, str]] = {}
+    valid_ports = []
+
+    # Port validation (avoid crash / undefined behavior)
+    for port in ports:
+        if not isinstance(port, int):
+            results[port] = (False, "Port must be an integer")
+        elif port < 1 or port > 65535:
+            results[port] = (False, "Port must be between 1 and 65535")
+        else:
+            valid_ports.append(port)
+
+    if not valid_ports:
+        return results
+
+    loop = asyncio.get_running_loop()
+    owns_endpoint = endpoint is None
+    addrs: List[Tuple[str, int]] = []
+
+    try:
+        # Responses are matched by sender address, so resolve to an IP first
+        infos = await loop.getaddrinfo(host, None, family=socket.AF_INET, type=socket.SOCK_DGRAM)
+        ip_address = infos[0][4][0]
+
+        if owns_endpoint:
+            endpoint = await open_udp_endpoint()
+
+        responses = {}
+        for port in valid_ports:
+            if do_log:
+                log(f"[UDP] Sending UDP probe to {host}:{port} (timeout={timeout}s)")
+            addr = (ip_address, port)
+            addrs.append(addr)
+            responses[port] = endpoint.expect(addr)
+
+        start = time.perf_counter()
+
+        # Send UDP packets (no handshake)
+        send_errors = endpoint.send_many(_PROBE_MESSAGE, addrs)
+        for (_, port), e in send_errors.items():
+            endpoint.forget((ip_address, port))
+            responses.pop(port).cancel()
+            results[port] = (False, f"OS error during UDP probe: {e}")
+
+        if responses:
+            await asyncio.wait(responses.values(), timeout=timeout)
+
+        for port, response in responses.items():
+            if not response.done():
+                # Best-effort: no response doesn't imply failure
+                results[port] = (True, "No response received (UDP is connectionless)")
+                continue
+
+            sender, received = response.result()
+            latency_ms = round((received - start) * 1000, 2)
+            if do_log:
+                log(f"[UDP] Response received from {sender} ({latency_ms} ms)")
+            results[port] = (True, f"Response received in {latency_ms} ms")
+
+    except socket.gaierror as e:
+        results.update((port, (False, f"Address resolution error: {e}")) for port in valid_ports)
+
+    except OSError as e:
+        results.update((port, (False, f"OS error during UDP probe: {e}")) for port in valid_ports)
+
+    except Exception as e:
+        results.update((port, (False, f"Unexpected error: {e}")) for port in valid_ports)
+
+    finally:
+        if endpoint is not None:
+            for addr in addrs:
+                endpoint.forget(addr)
+            if owns_endpoint:
+                endpoint.close()
+
+    return results
+
 
 # Test this module
 if __name__ == "__main__":
-    import sys
-
     def log(msg: str) -> None:
         print(msg, file=sys.stderr)
 
@@ -94,4 +414,33 @@ if __name__ == "__main__":
         ok, detail = udp_check(host, port, timeout=3.0, log=log)
         print(f"Result: success={ok}, detail={detail}")
 
+    # Batch path against local echo sockets: once through sendmmsg (Linux
+    # only) and once through the per-datagram sendto fallback
+    import threading
+
+    def echo(server: socket.socket) -> None:
+        while True:
+            data, addr = server.recvfrom(1024)
+            server.sendto(data, addr)
+
+    echo_ports = []
+    for _ in range(3):
+        server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        server.bind(("127.0.0.1", 0))
+        echo_ports.append(server.getsockname()[1])
+        threading.Thread(target=echo, args=(server,), daemon=True).start()
+
+    send_paths = [("sendto", None)]
+    if _sendmmsg is not None:
+        send_paths.insert(0, ("sendmmsg", _sendmmsg))
+
+    for name, impl in send_paths:
+        globals()["_sendmmsg"] = impl
+        print("-" * 50)
+        results = asyncio.run(udp_check_batch_async("127.0.0.1", echo_ports, timeout=1.0, log=log))
+        for port in echo_ports:
+            ok, detail = results[port]
+            assert ok and detail.startswith("Response received"), (name, port, detail)
+        print(f"Batch send via {name}: all {len(echo_ports)} echo ports replied")
+
 